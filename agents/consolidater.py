@@ -96,6 +96,7 @@ async def consolidate_tutorial(
     theory_section: TheorySection,
     examples_section: ExamplesSection,
     python_code_section: PythonCodeSection,
+    ollama_client: AsyncClient | None = None,
 ) -> ConsolidatorAgentOutput:
     """
     Consolidate theory, examples, and Python code sections into a comprehensive tutorial.
@@ -105,6 +106,7 @@ async def consolidate_tutorial(
         theory_section: Theory content from theory agent
         examples_section: Examples content from examples agent
         python_code_section: Python code content from python code agent
+        ollama_client: Client to use instead of the module-level one
 
     Returns:
         ConsolidatorAgentOutput: Complete consolidated tutorial document
@@ -131,7 +133,7 @@ async def consolidate_tutorial(
     Create a unified tutorial that flows naturally from theory to examples to implementation, with appropriate introductions, transitions, and conclusions.
     """
 
-    response = await client.chat(
+    response = await (ollama_client or client).chat(
         model=model,
         messages=messages + [{"role": "user", "content": consolidation_prompt}],
         format=ConsolidatorAgentOutput.model_json_schema(),
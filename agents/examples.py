@@ -59,10 +59,12 @@ class ExamplesAgentOutput(BaseModel):
 
 
 # Async function
-async def create_examples(concept: str) -> ExamplesAgentOutput:
+async def create_examples(
+    concept: str, ollama_client: AsyncClient | None = None
+) -> ExamplesAgentOutput:
     "Create examples section."
 
-    response = await client.chat(
+    response = await (ollama_client or client).chat(
         model=model,
         messages=messages + [{"role": "user", "content": f"Concept: {concept}"}],
         format=ExamplesAgentOutput.model_json_schema(),
@@ -69,10 +69,12 @@ class PythonCodeAgentOutput(BaseModel):
 
 
 # Async function
-async def create_python_code(concept: str) -> PythonCodeAgentOutput:
+async def create_python_code(
+    concept: str, ollama_client: AsyncClient | None = None
+) -> PythonCodeAgentOutput:
     "Create Python code section."
 
-    response = await client.chat(
+    response = await (ollama_client or client).chat(
         model=model,
         messages=messages + [{"role": "user", "content": f"Concept: {concept}"}],
         format=PythonCodeAgentOutput.model_json_schema(),
@@ -56,10 +56,12 @@ class TheoryAgentOutput(BaseModel):
 
 
 # Async function
-async def create_theory(concept: str) -> TheoryAgentOutput:
+async def create_theory(
+    concept: str, ollama_client: AsyncClient | None = None
+) -> TheoryAgentOutput:
     "Create theory section."
 
-    response = await client.chat(
+    response = await (ollama_client or client).chat(
         model=model,
         messages=messages + [{"role": "user", "content": f"Concept: {concept}"}],
         format=TheoryAgentOutput.model_json_schema(),
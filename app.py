@@ -1,15 +1,9 @@
 import asyncio
 import streamlit as st
 from agents.intent_classifier import classify_intent
-from agents.theory import create_theory
-from agents.examples import create_examples
-from agents.python_code import create_python_code
-from agents.consolidater import (
-    consolidate_tutorial,
-    TheorySection,
-    ExamplesSection,
-    PythonCodeSection,
-)
+from agents.consolidater import consolidate_tutorial
+from pipeline import create_sections
+from prefetcher import Prefetcher
 
 # Configure Streamlit page
 st.set_page_config(
@@ -20,6 +14,15 @@ st.set_page_config(
 )
 
 
+@st.cache_resource
+def get_prefetcher():
+    """Shared prefetcher, started once per Streamlit server process."""
+
+    prefetcher = Prefetcher()
+    prefetcher.start()
+    return prefetcher
+
+
 def main():
     """Main Streamlit app function."""
 
@@ -42,6 +45,22 @@ def main():
 
         st.markdown("---")
 
+        # Prefetch cache statistics
+        st.header("⚡ Prefetch Cache")
+        stats = get_prefetcher().stats()
+        st.metric(
+            "Cache hit rate",
+            f"{stats.hit_rate:.0%}",
+            delta=f"{stats.hit_rate_improvement:+.0%} from prefetching",
+        )
+        st.caption(
+            f"{stats.hits}/{stats.lookups} requests served from cache · "
+            f"{stats.prefetches_completed} tutorials prefetched · "
+            f"{stats.prefetches_yielded} prefetches yielded to users"
+        )
+
+        st.markdown("---")
+
         # Clear button
         if st.button("🗑️ Clear Session", type="secondary", use_container_width=True):
             # Clear session state
@@ -89,102 +108,117 @@ def main():
 async def generate_tutorial(concept, progress_bar, status_text):
     """Generate tutorial content using async agents."""
 
-    try:
-        # Step 1: Intent classification
-        status_text.text("🔍 Checking if concept is within data science scope...")
-        progress_bar.progress(10)
-
-        with st.spinner("Classifying intent..."):
-            intent_result = await classify_intent(concept)
+    prefetcher = get_prefetcher()
 
-        if not intent_result.in_scope:
+    try:
+        # Serve a warm tutorial straight from the cache if available
+        cached_result = prefetcher.lookup(concept)
+        if cached_result is not None:
             progress_bar.progress(100)
-            st.error("❌ Concept Out of Scope")
-            st.warning(f"The concept '{concept}' is not within the data science scope.")
-            st.info(f"**Reason:** {intent_result.reason}")
-            st.info(f"**Confidence:** {intent_result.confidence:.2f}")
+            status_text.text("⚡ Tutorial served from cache!")
+            display_tutorial(concept, cached_result)
             return
 
-        # Show success for intent classification
-        st.success(
-            f"✅ Concept is within scope! (Confidence: {intent_result.confidence:.2f})"
-        )
-        st.info(f"**Reason:** {intent_result.reason}")
+        with prefetcher.interactive():
+            consolidated_result = await run_agents(
+                concept, progress_bar, status_text, prefetcher
+            )
+        if consolidated_result is None:
+            return
 
-        progress_bar.progress(25)
+        prefetcher.store(concept, consolidated_result)
+        display_tutorial(concept, consolidated_result)
 
-        # Step 2: Generate content concurrently
-        status_text.text(
-            "🛠️ Generating tutorial content (Theory, Examples, Python Code)..."
-        )
+    except Exception as e:
+        progress_bar.progress(0)
+        status_text.text("")
+        st.error(f"❌ Error during tutorial generation: {str(e)}")
+        st.exception(e)
 
-        with st.spinner("Running AI agents concurrently..."):
-            # Run all three agents concurrently
-            theory_task = create_theory(concept)
-            examples_task = create_examples(concept)
-            python_code_task = create_python_code(concept)
 
-            theory_result, examples_result, python_code_result = await asyncio.gather(
-                theory_task, examples_task, python_code_task
-            )
+async def run_agents(concept, progress_bar, status_text, prefetcher):
+    """Run the agent pipeline, returning None if the concept is out of scope."""
 
-        st.success("✅ All content sections generated successfully!")
-        progress_bar.progress(75)
+    # Step 1: Intent classification
+    status_text.text("🔍 Checking if concept is within data science scope...")
+    progress_bar.progress(10)
 
-        # Step 3: Consolidate the outputs
-        status_text.text("🔄 Consolidating tutorial sections...")
+    with st.spinner("Classifying intent..."):
+        intent_result = await classify_intent(concept)
 
-        with st.spinner("Consolidating tutorial..."):
-            # Prepare sections for consolidator
-            theory_section = TheorySection(
-                title=theory_result.title, body=theory_result.body
-            )
+    if not intent_result.in_scope:
+        progress_bar.progress(100)
+        st.error("❌ Concept Out of Scope")
+        st.warning(f"The concept '{concept}' is not within the data science scope.")
+        st.info(f"**Reason:** {intent_result.reason}")
+        st.info(f"**Confidence:** {intent_result.confidence:.2f}")
+        return None
 
-            examples_section = ExamplesSection(
-                title=examples_result.title, examples=examples_result.examples
-            )
+    prefetcher.record_request(concept)
 
-            python_code_section = PythonCodeSection(
-                title=python_code_result.title, code=python_code_result.code
-            )
+    # Show success for intent classification
+    st.success(
+        f"✅ Concept is within scope! (Confidence: {intent_result.confidence:.2f})"
+    )
+    st.info(f"**Reason:** {intent_result.reason}")
 
-            # Consolidate into final tutorial
-            consolidated_result = await consolidate_tutorial(
-                concept=concept,
-                theory_section=theory_section,
-                examples_section=examples_section,
-                python_code_section=python_code_section,
-            )
+    progress_bar.progress(25)
 
-        st.success("✅ Tutorial consolidated successfully!")
-        progress_bar.progress(100)
-        status_text.text("✨ Tutorial generation completed!")
+    # Step 2: Generate content concurrently
+    status_text.text(
+        "🛠️ Generating tutorial content (Theory, Examples, Python Code)..."
+    )
 
-        # Step 4: Display tutorial content
-        st.markdown("---")
-        st.header("📚 Generated Tutorial")
-
-        # Tutorial title and summary
-        st.subheader(consolidated_result.title)
-        st.info(f"**Summary:** {consolidated_result.summary}")
-
-        # Full tutorial content
-        st.markdown("### 📖 Complete Tutorial")
-        st.markdown(consolidated_result.tutorial_content)
-
-        # Download button for the tutorial
-        st.download_button(
-            label="📥 Download Tutorial",
-            data=f"# {consolidated_result.title}\n\n**Summary:** {consolidated_result.summary}\n\n{consolidated_result.tutorial_content}",
-            file_name=f"{concept.replace(' ', '_').lower()}_tutorial.md",
-            mime="text/markdown",
+    with st.spinner("Running AI agents concurrently..."):
+        # Run all three agents concurrently
+        theory_section, examples_section, python_code_section = await create_sections(
+            concept
         )
 
-    except Exception as e:
-        progress_bar.progress(0)
-        status_text.text("")
-        st.error(f"❌ Error during tutorial generation: {str(e)}")
-        st.exception(e)
+    st.success("✅ All content sections generated successfully!")
+    progress_bar.progress(75)
+
+    # Step 3: Consolidate the outputs
+    status_text.text("🔄 Consolidating tutorial sections...")
+
+    with st.spinner("Consolidating tutorial..."):
+        # Consolidate into final tutorial
+        consolidated_result = await consolidate_tutorial(
+            concept=concept,
+            theory_section=theory_section,
+            examples_section=examples_section,
+            python_code_section=python_code_section,
+        )
+
+    st.success("✅ Tutorial consolidated successfully!")
+    progress_bar.progress(100)
+    status_text.text("✨ Tutorial generation completed!")
+
+    return consolidated_result
+
+
+def display_tutorial(concept, consolidated_result):
+    """Display the tutorial content and download button."""
+
+    # Step 4: Display tutorial content
+    st.markdown("---")
+    st.header("📚 Generated Tutorial")
+
+    # Tutorial title and summary
+    st.subheader(consolidated_result.title)
+    st.info(f"**Summary:** {consolidated_result.summary}")
+
+    # Full tutorial content
+    st.markdown("### 📖 Complete Tutorial")
+    st.markdown(consolidated_result.tutorial_content)
+
+    # Download button for the tutorial
+    st.download_button(
+        label="📥 Download Tutorial",
+        data=f"# {consolidated_result.title}\n\n**Summary:** {consolidated_result.summary}\n\n{consolidated_result.tutorial_content}",
+        file_name=f"{concept.replace(' ', '_').lower()}_tutorial.md",
+        mime="text/markdown",
+    )
 
 
 if __name__ == "__main__":
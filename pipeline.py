@@ -0,0 +1,58 @@
+"""
+Tutorial generation pipeline shared by the app and the prefetcher.
+"""
+
+import asyncio
+
+from ollama import AsyncClient
+
+from agents.theory import create_theory
+from agents.examples import create_examples
+from agents.python_code import create_python_code
+from agents.consolidater import (
+    consolidate_tutorial,
+    ConsolidatorAgentOutput,
+    TheorySection,
+    ExamplesSection,
+    PythonCodeSection,
+)
+
+
+async def create_sections(
+    concept: str, ollama_client: AsyncClient | None = None
+) -> tuple[TheorySection, ExamplesSection, PythonCodeSection]:
+    "Run the theory, examples and Python code agents concurrently."
+
+    theory_result, examples_result, python_code_result = await asyncio.gather(
+        create_theory(concept, ollama_client),
+        create_examples(concept, ollama_client),
+        create_python_code(concept, ollama_client),
+    )
+
+    return (
+        TheorySection(title=theory_result.title, body=theory_result.body),
+        ExamplesSection(
+            title=examples_result.title, examples=examples_result.examples
+        ),
+        PythonCodeSection(
+            title=python_code_result.title, code=python_code_result.code
+        ),
+    )
+
+
+async def build_tutorial(
+    concept: str, ollama_client: AsyncClient | None = None
+) -> ConsolidatorAgentOutput:
+    "Create all sections and consolidate them into a tutorial, without UI."
+
+    theory_section, examples_section, python_code_section = await create_sections(
+        concept, ollama_client
+    )
+
+    return await consolidate_tutorial(
+        concept=concept,
+        theory_section=theory_section,
+        examples_section=examples_section,
+        python_code_section=python_code_section,
+        ollama_client=ollama_client,
+    )
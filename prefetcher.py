@@ -0,0 +1,288 @@
+"""
+Popularity-driven prefetcher that warms tutorials while the Ollama backend is idle.
+
+Every in-scope concept requested through the app is recorded with an
+exponentially decayed popularity score. A background thread watches for idle
+periods (no interactive generation in flight) and generates or refreshes the
+tutorials of the hottest concepts whose cached copy is missing or stale. As soon
+as an interactive request arrives, the running prefetch is cancelled so the
+backend is handed back to the user.
+"""
+
+import asyncio
+import heapq
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+from ollama import AsyncClient
+
+from agents.consolidater import ConsolidatorAgentOutput
+from pipeline import build_tutorial
+
+load_dotenv()
+
+# Prefetch configuration (all optional, see README)
+top_k = int(os.environ.get("PREFETCH_TOP_K", "200"))
+ttl_seconds = float(os.environ.get("PREFETCH_TTL_HOURS", "24")) * 3600
+half_life_seconds = float(os.environ.get("PREFETCH_HALF_LIFE_HOURS", "72")) * 3600
+idle_seconds = float(os.environ.get("PREFETCH_IDLE_SECONDS", "30"))
+poll_seconds = float(os.environ.get("PREFETCH_POLL_SECONDS", "5"))
+cache_size = max(top_k, int(os.environ.get("PREFETCH_CACHE_SIZE", str(2 * top_k))))
+failure_backoff_seconds = 600
+# Popularity entries decayed below this score are forgotten
+min_score = 0.01
+
+
+def normalize_concept(concept: str) -> str:
+    "Normalize a concept so that trivially different spellings share a cache entry."
+
+    return " ".join(concept.lower().split())
+
+
+@dataclass
+class CachedTutorial:
+    "A generated tutorial and where it came from."
+
+    tutorial: ConsolidatorAgentOutput
+    created_at: float
+    prefetched: bool
+    served: bool = False
+
+    def is_stale(self, now: float) -> bool:
+        return now - self.created_at > ttl_seconds
+
+
+@dataclass
+class PopularityEntry:
+    "Decayed request count of a concept."
+
+    concept: str
+    score: float
+    updated_at: float
+    requests: int = 0
+
+    def decayed_score(self, now: float) -> float:
+        elapsed = now - self.updated_at
+        return self.score * math.exp(-math.log(2) * elapsed / half_life_seconds)
+
+
+@dataclass
+class PrefetchStats:
+    "Cache counters used to report the hit rate the prefetcher delivers."
+
+    # Requests for in-scope concepts, i.e. ones that can be cached
+    lookups: int = 0
+    hits: int = 0
+    # Hits that would have been misses without prefetching
+    prefetched_hits: int = 0
+    prefetches_completed: int = 0
+    prefetches_yielded: int = 0
+    prefetches_failed: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    def baseline_hit_rate(self) -> float:
+        "Hit rate the cache would have had without prefetched entries."
+
+        if not self.lookups:
+            return 0.0
+        return (self.hits - self.prefetched_hits) / self.lookups
+
+    @property
+    def hit_rate_improvement(self) -> float:
+        return self.hit_rate - self.baseline_hit_rate
+
+
+class Prefetcher:
+    "Tracks concept popularity and warms the tutorial cache during idle time."
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache: dict[str, CachedTutorial] = {}
+        self._popularity: dict[str, PopularityEntry] = {}
+        self._failed_at: dict[str, float] = {}
+        self._stats = PrefetchStats()
+        self._interactive = 0
+        self._last_interactive = time.time()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+
+    # Interactive side
+    def record_request(self, concept: str) -> None:
+        "Record a cache miss for a concept that passed intent classification."
+
+        with self._lock:
+            self._record(concept, time.time())
+
+    def lookup(self, concept: str) -> ConsolidatorAgentOutput | None:
+        """
+        Return a fresh cached tutorial for the concept.
+
+        Hits are recorded as requests here. Misses are not, since the concept may
+        be out of scope; call `record_request` once it has been classified.
+        """
+
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(normalize_concept(concept))
+            if cached is None or cached.is_stale(now):
+                return None
+            self._record(concept, now)
+            self._stats.hits += 1
+            # Only the first hit is earned by prefetching; later ones would have
+            # hit the copy stored by that first interactive request anyway.
+            if cached.prefetched and not cached.served:
+                self._stats.prefetched_hits += 1
+            cached.served = True
+            return cached.tutorial
+
+    def store(self, concept: str, tutorial: ConsolidatorAgentOutput) -> None:
+        "Cache a tutorial produced by an interactive request."
+
+        self._store(concept, tutorial, prefetched=False)
+
+    @contextmanager
+    def interactive(self):
+        "Mark the backend busy for the duration of an interactive request."
+
+        with self._lock:
+            self._interactive += 1
+            task = self._task
+        if task is not None and self._loop is not None:
+            # Yield the backend right away.
+            self._loop.call_soon_threadsafe(task.cancel)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._interactive -= 1
+                self._last_interactive = time.time()
+
+    def stats(self) -> PrefetchStats:
+        with self._lock:
+            return PrefetchStats(**vars(self._stats))
+
+    # Background side
+    def start(self) -> None:
+        "Start the background prefetch thread (idempotent)."
+
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self._run(),), name="prefetcher", daemon=True
+        )
+        self._thread.start()
+
+    def _record(self, concept: str, now: float) -> None:
+        key = normalize_concept(concept)
+        entry = self._popularity.get(key)
+        if entry is None:
+            entry = PopularityEntry(concept=concept, score=0.0, updated_at=now)
+            self._popularity[key] = entry
+        entry.score = entry.decayed_score(now) + 1.0
+        entry.updated_at = now
+        entry.requests += 1
+        self._stats.lookups += 1
+
+    def _store(
+        self, concept: str, tutorial: ConsolidatorAgentOutput, prefetched: bool
+    ) -> None:
+        with self._lock:
+            now = time.time()
+            self._cache[normalize_concept(concept)] = CachedTutorial(
+                tutorial=tutorial, created_at=now, prefetched=prefetched
+            )
+            self._evict(now)
+
+    def _hot_keys(self, now: float) -> list[str]:
+        "Top-k concepts by decayed score, forgetting the ones that have gone cold."
+
+        for key, entry in list(self._popularity.items()):
+            if entry.decayed_score(now) < min_score:
+                del self._popularity[key]
+        for key, failed_at in list(self._failed_at.items()):
+            if now - failed_at >= failure_backoff_seconds:
+                del self._failed_at[key]
+
+        return heapq.nlargest(
+            top_k,
+            self._popularity,
+            key=lambda key: self._popularity[key].decayed_score(now),
+        )
+
+    def _evict(self, now: float) -> None:
+        "Drop the oldest entries outside the hot set once the cache is over size."
+
+        if len(self._cache) <= cache_size:
+            return
+        hot = set(self._hot_keys(now))
+        evictable = sorted(
+            self._cache, key=lambda key: (key in hot, self._cache[key].created_at)
+        )
+        for key in evictable[: len(self._cache) - cache_size]:
+            del self._cache[key]
+
+    def _is_idle(self) -> bool:
+        with self._lock:
+            return (
+                self._interactive == 0
+                and time.time() - self._last_interactive >= idle_seconds
+            )
+
+    def _next_candidate(self) -> str | None:
+        "Most popular top-k concept whose cached tutorial is missing or stale."
+
+        now = time.time()
+        with self._lock:
+            for key in self._hot_keys(now):
+                if key in self._failed_at:
+                    continue
+                cached = self._cache.get(key)
+                if cached is None or cached.is_stale(now):
+                    return self._popularity[key].concept
+        return None
+
+    async def _run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        # The agents' module-level clients belong to the interactive event loops;
+        # httpx connection pools must not be shared across loops or threads.
+        ollama_client = AsyncClient()
+        while True:
+            await asyncio.sleep(poll_seconds)
+            if not self._is_idle():
+                continue
+
+            concept = self._next_candidate()
+            if concept is None:
+                continue
+
+            task = asyncio.create_task(build_tutorial(concept, ollama_client))
+            with self._lock:
+                # Traffic may have arrived between the idle check and now.
+                if self._interactive:
+                    task.cancel()
+                self._task = task
+            await asyncio.wait({task})
+            with self._lock:
+                self._task = None
+
+            if task.cancelled():
+                with self._lock:
+                    self._stats.prefetches_yielded += 1
+            elif task.exception() is not None:
+                with self._lock:
+                    self._failed_at[normalize_concept(concept)] = time.time()
+                    self._stats.prefetches_failed += 1
+            else:
+                self._store(concept, task.result(), prefetched=True)
+                with self._lock:
+                    self._stats.prefetches_completed += 1
@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+
+import prefetcher
+from agents.consolidater import ConsolidatorAgentOutput
+from prefetcher import Prefetcher
+
+
+def make_tutorial(concept):
+    return ConsolidatorAgentOutput(
+        title=concept, tutorial_content=f"All about {concept}", summary=concept
+    )
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_decayed_score_halves_after_half_life():
+    entry = prefetcher.PopularityEntry(concept="PCA", score=4.0, updated_at=0.0)
+
+    assert entry.decayed_score(prefetcher.half_life_seconds) == pytest.approx(2.0)
+
+
+def test_candidates_ranked_by_frequency_and_recency():
+    p = Prefetcher()
+    p.record_request("PCA")
+    p.record_request("K-Means")
+    p.record_request("k-means ")
+    assert p._next_candidate() == "K-Means"
+
+    # Two half-lives ago, K-Means is now worth 0.5 against PCA's 1.0
+    p._popularity["k-means"].updated_at -= 2 * prefetcher.half_life_seconds
+    assert p._next_candidate() == "PCA"
+
+
+def test_only_missing_or_stale_tutorials_are_prefetched():
+    p = Prefetcher()
+    p.record_request("PCA")
+    p.store("PCA", make_tutorial("PCA"))
+    assert p._next_candidate() is None
+
+    p._cache["pca"].created_at -= prefetcher.ttl_seconds + 1
+    assert p.lookup("PCA") is None
+    assert p._next_candidate() == "PCA"
+
+
+def test_failed_concepts_are_backed_off():
+    p = Prefetcher()
+    p.record_request("PCA")
+    p._failed_at["pca"] = time.time()
+    assert p._next_candidate() is None
+
+    p._failed_at["pca"] -= prefetcher.failure_backoff_seconds
+    assert p._next_candidate() == "PCA"
+
+
+def test_only_first_hit_on_prefetched_entry_counts_as_improvement():
+    p = Prefetcher()
+    p.record_request("PCA")
+    p._store("PCA", make_tutorial("PCA"), prefetched=True)
+    for _ in range(3):
+        assert p.lookup("PCA").title == "PCA"
+
+    stats = p.stats()
+    assert (stats.lookups, stats.hits, stats.prefetched_hits) == (4, 3, 1)
+    assert stats.hit_rate_improvement == pytest.approx(1 / 4)
+
+
+def test_misses_are_only_counted_once_recorded():
+    p = Prefetcher()
+    assert p.lookup("Gardening") is None
+    assert p.stats().lookups == 0
+
+    p.record_request("PCA")
+    assert p.stats().lookups == 1
+
+
+def test_cold_concepts_are_forgotten():
+    p = Prefetcher()
+    p.record_request("PCA")
+    p._popularity["pca"].updated_at -= 10 * prefetcher.half_life_seconds
+
+    assert p._next_candidate() is None
+    assert p._popularity == {}
+
+
+def test_cache_evicts_oldest_entries_outside_top_k(monkeypatch):
+    monkeypatch.setattr(prefetcher, "top_k", 1)
+    monkeypatch.setattr(prefetcher, "cache_size", 2)
+    p = Prefetcher()
+    p.record_request("PCA")
+    p.store("PCA", make_tutorial("PCA"))
+    p.store("SVM", make_tutorial("SVM"))
+    p.store("LDA", make_tutorial("LDA"))
+
+    assert set(p._cache) == {"pca", "lda"}
+
+
+@pytest.fixture
+def fast_prefetcher(monkeypatch):
+    monkeypatch.setattr(prefetcher, "idle_seconds", 0.0)
+    monkeypatch.setattr(prefetcher, "poll_seconds", 0.01)
+    started = []
+
+    async def build_tutorial(concept, ollama_client=None):
+        started.append(concept)
+        await asyncio.sleep(0.2)
+        return make_tutorial(concept)
+
+    monkeypatch.setattr(prefetcher, "build_tutorial", build_tutorial)
+    p = Prefetcher()
+    p._last_interactive = 0.0
+    return p, started
+
+
+def test_idle_prefetch_warms_cache(fast_prefetcher):
+    p, _ = fast_prefetcher
+    p.record_request("PCA")
+    p.start()
+
+    wait_for(lambda: p.stats().prefetches_completed == 1)
+    assert p.lookup("PCA").title == "PCA"
+    assert p.stats().prefetched_hits == 1
+
+
+def test_prefetch_yields_to_interactive_traffic(fast_prefetcher):
+    p, started = fast_prefetcher
+    p.record_request("PCA")
+    p.start()
+
+    wait_for(lambda: started and p._task is not None)
+    with p.interactive():
+        wait_for(lambda: p.stats().prefetches_yielded == 1)
+        time.sleep(0.05)
+        assert len(started) == 1
+    assert p.lookup("PCA") is None